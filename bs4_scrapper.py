@@ -1,21 +1,24 @@
+import asyncio
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
-import json
-from typing import List, Dict
+from selectolax.lexbor import LexborHTMLParser, LexborNode as Node
+import orjson
+from typing import Any, AsyncIterator, Callable, List, Dict, NamedTuple, Optional, Tuple
 import time
-import random
 from pathlib import Path
+from email.utils import parsedate_to_datetime
 import logging
 import sys
 from fake_useragent import UserAgent
 from tenacity import retry, stop_after_attempt, wait_exponential
 import cloudscraper
-import re
+from scraper_common import ResponseCache, jsonl_to_json
 
 # Configure logging to output to both file and console
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format='%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S',
     handlers=[
         logging.FileHandler("scraper.log"),
         logging.StreamHandler(sys.stdout)
@@ -23,10 +26,164 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of ZIP codes scraped at the same time
+MAX_PARALLEL_ZIPS = 8
+
+# Used when a Retry-After header is not a number of seconds
+DEFAULT_RETRY_AFTER = 30
+
+# Cached responses younger than this many seconds are reused instead of re-fetched
+CACHE_TTL = 3600
+
+# Request headers that are the same for every request
+_BASE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Cache-Control': 'max-age=0'
+}
+
+# Deal links on the search page. Card-specific selectors (figure.card-ui a,
+# div.deal-card a, ...) only ever contributed anchors that this one also matches,
+# since links without '/deals/' in the href are discarded anyway
+_LINK_SELECTOR = "a[href*='/deals/']"
+
+def _canon(href: str, base_url: str) -> Optional[str]:
+    """Return the absolute URL of a deal link, or None if href is not a deal page."""
+    if '/deals/' not in href or href.endswith('/deals/'):
+        return None
+    return base_url + href if href[0] == '/' else href
+
+class _Field(NamedTuple):
+    """A deal page field: the class-name substring marking it and how to read its value."""
+    class_name: str
+    extract: Callable[[Node], Any]
+    tags: Optional[Tuple[str, ...]] = None
+    many: bool = False
+
+def _schema_selector(schema: Dict[str, _Field]) -> str:
+    """Build one selector matching every field of a schema, case-insensitively.
+
+    :is() returns each element once even when it matches several of the fields.
+    """
+    selectors = [
+        f"{tag}[class*='{field.class_name}' i]"
+        for field in schema.values()
+        for tag in field.tags or ("",)
+    ]
+    return f":is({', '.join(selectors)})"
+
+def _extract(nodes: List[Node], schema: Dict[str, _Field]) -> Dict[str, Any]:
+    """Read the schema's fields from nodes matched by its selector, in one loop.
+
+    A field takes its first match in document order, or every non-empty match
+    when it is a many field. Fields are returned in schema order.
+    """
+    data = {}
+    for node in nodes:
+        classes = (node.attributes.get('class') or '').lower()
+        for name, field in schema.items():
+            if field.class_name not in classes or (field.tags and node.tag not in field.tags):
+                continue
+            if field.many:
+                value = field.extract(node)
+                if value:
+                    data.setdefault(name, []).append(value)
+            elif name not in data:
+                data[name] = field.extract(node)
+    return {name: data[name] for name in schema if name in data}
+
+def _text(node: Node) -> str:
+    return node.text(strip=True)
+
+def _list_items(node: Node) -> List[str]:
+    return [item.text(strip=True) for item in node.css("li")]
+
+_PRICE_FIELDS = {
+    "original_price": _Field("original-price", _text),
+    "current_price": _Field("current-price", _text)
+}
+_PRICE_SELECTOR = _schema_selector(_PRICE_FIELDS)
+
+def _price_option(node: Node) -> Dict[str, str]:
+    return _extract(node.css(_PRICE_SELECTOR), _PRICE_FIELDS)
+
+_DETAIL_FIELDS = {
+    "title": _Field("deal-title", _text, tags=("h1", "h2")),
+    "merchant": _Field("merchant-name", _text),
+    "price_options": _Field("deal-option", _price_option, many=True),
+    "highlights": _Field("highlights", _list_items),
+    "fine_print": _Field("fine-print", _text)
+}
+_DETAIL_SELECTOR = _schema_selector(_DETAIL_FIELDS)
+
+def parse_retry_after(value: str) -> float:
+    """Convert a Retry-After header (seconds or HTTP date) to a delay in seconds."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+class RateLimiter:
+    """Async token bucket allowing max_rate requests per time_period seconds."""
+
+    def __init__(self, max_rate: float, time_period: float = 60, burst: int = 1):
+        self.rate = max_rate / time_period
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def pause(self, seconds: float):
+        """Hold back every request for the given number of seconds, e.g. after a Retry-After."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    continue
+                
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 class GrouponScraper:
-    def __init__(self):
+    BASE_URL = "https://www.groupon.com"
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_minute: float = 20,
+        cache_dir: Optional[Path] = Path("cache"),
+        debug: bool = False
+    ):
         try:
-            print("Initializing scraper...")
+            logger.info("Initializing scraper...")
+            # When set, every response is also written to disk for inspection
+            self.debug = debug
+            
             # Initialize cloudscraper to bypass cloudflare
             self.scraper = cloudscraper.create_scraper(
                 browser={
@@ -34,252 +191,257 @@ class GrouponScraper:
                     'platform': 'windows',
                     'mobile': False
                 },
-                debug=True
+                debug=debug
             )
             
             # Initialize fake user agent
             self.ua = UserAgent()
-            print("Scraper initialized successfully")
+            
+            # Deal pages are fetched concurrently, at most max_concurrency at a time
+            self.max_concurrency = max_concurrency
+            self.semaphore = asyncio.Semaphore(max_concurrency)
+            # All requests share one rate limit, however many are in flight
+            self.limiter = RateLimiter(requests_per_minute, 60)
+            # Re-runs read pages from here instead of the network; None disables it
+            self.cache = ResponseCache(cache_dir, CACHE_TTL) if cache_dir is not None else None
+            self.session: Optional[aiohttp.ClientSession] = None
+            logger.info("Scraper initialized successfully")
             
         except Exception as e:
-            print(f"Error initializing scraper: {str(e)}")
+            logger.exception(f"Error initializing scraper: {e}")
             raise
 
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Pass the Cloudflare check once with cloudscraper and open an aiohttp session with its cookies."""
+        logger.info(f"Obtaining Cloudflare cookies from: {self.BASE_URL}")
+        # cf_clearance is bound to the User-Agent that earned it, so every later
+        # request goes out with these same headers
+        headers = self.get_random_headers()
+        await asyncio.to_thread(
+            self.scraper.get,
+            self.BASE_URL,
+            headers=headers,
+            timeout=30
+        )
+        # Keep idle connections open across the pauses between deals and ZIP codes
+        # so repeated requests reuse the pooled TCP/TLS connections. The per-host
+        # limit covers every deal and search request that can be in flight, so a
+        # request that already holds a rate limiter token never queues for a socket.
+        # Groupon's address is cached for five minutes instead of aiohttp's default 10s
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=self.max_concurrency + MAX_PARALLEL_ZIPS,
+                keepalive_timeout=60,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            ),
+            headers=headers,
+            cookies=self.scraper.cookies.get_dict(),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+
+    async def close(self):
+        """Close the aiohttp session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
     def get_random_headers(self):
-        """Generate random headers for each request."""
-        headers = {
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0'
-        }
-        print(f"\nUsing headers:\n{json.dumps(headers, indent=2)}")
-        return headers
+        """Generate headers with a random User-Agent."""
+        return {**_BASE_HEADERS, 'User-Agent': self.ua.random}
+
+    def _save_debug_response(self, content: bytes) -> Path:
+        """Write a response body to response.html and the debug directory."""
+        with open("response.html", "wb") as f:
+            f.write(content)
+        
+        debug_dir = Path("debug")
+        debug_dir.mkdir(exist_ok=True)
+        debug_file = debug_dir / f"response_{time.time_ns()}.html"
+        with open(debug_file, "wb") as f:
+            f.write(content)
+        return debug_file
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
     )
-    def make_request(self, url: str) -> str:
-        """Make a request with retry logic and rotating headers."""
+    async def make_request(self, url: str) -> bytes:
+        """Make a request with retry logic, returning the raw body."""
         try:
-            print(f"\nMaking request to: {url}")
-            headers = self.get_random_headers()
+            if self.cache is not None:
+                cached = await asyncio.to_thread(self.cache.get, url)
+                if cached is not None:
+                    logger.debug(f"Using cached response for: {url}")
+                    return cached
             
-            response = self.scraper.get(
-                url,
-                headers=headers,
-                timeout=30
-            )
-            
-            # Print response details
-            print(f"\nResponse Status: {response.status_code}")
-            print("\nResponse Headers:")
-            print(json.dumps(dict(response.headers), indent=2))
+            logger.debug(f"Making request to: {url}")
             
-            content = response.text
-            print(f"\nResponse length: {len(content)} characters")
-            
-            # store the response in a file
-            with open("response.html", "w", encoding='utf-8') as f:
-                f.write(content)
+            async with self.limiter, self.session.get(url) as response:
+                logger.debug(f"Response Status: {response.status}")
+                if response.status in (429, 503) and "Retry-After" in response.headers:
+                    # Back off everyone as the server asks, then let tenacity retry
+                    self.limiter.pause(parse_retry_after(response.headers["Retry-After"]))
+                    response.raise_for_status()
+                # Keep the body as bytes; Lexbor parses UTF-8 directly, so decoding
+                # it to a str first would only add a copy
+                content = await response.read()
+                status = response.status
+            logger.debug(f"Response length: {len(content)} bytes")
             
             # Check for common blocking patterns
-            if "captcha" in content.lower():
-                print("WARNING: Captcha detected in response!")
-            if "cloudflare" in content.lower():
-                print("WARNING: Cloudflare challenge detected!")
-            if "access denied" in content.lower():
-                print("WARNING: Access denied message detected!")
-            if "robot" in content.lower() or "bot" in content.lower():
-                print("WARNING: Bot detection message found!")
+            lowered = content.lower()
+            blocked = False
+            if b"captcha" in lowered:
+                logger.warning(f"Captcha detected in response from {url}")
+                blocked = True
+            if b"cloudflare" in lowered:
+                logger.warning(f"Cloudflare challenge detected in response from {url}")
+                blocked = True
+            if b"access denied" in lowered:
+                logger.warning(f"Access denied message detected in response from {url}")
+                blocked = True
+            if b"robot" in lowered or b"bot" in lowered:
+                logger.warning(f"Bot detection message found in response from {url}")
+            
+            # Save the response for debugging, off the event loop
+            if self.debug:
+                debug_file = await asyncio.to_thread(self._save_debug_response, content)
+                logger.debug(f"Full response saved to: {debug_file}")
             
-            # Save the response for debugging
-            debug_dir = Path("debug")
-            debug_dir.mkdir(exist_ok=True)
-            debug_file = debug_dir / f"response_{int(time.time())}.html"
-            with open(debug_file, "w", encoding='utf-8') as f:
-                f.write(content)
-            print(f"\nFull response saved to: {debug_file}")
+            # Block pages are never cached, so the next run fetches the real page
+            if self.cache is not None and status == 200 and not blocked:
+                await asyncio.to_thread(self.cache.set, url, content)
             
             return content
             
         except Exception as e:
-            print(f"Error making request: {str(e)}")
-            print("Full error details:")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error making request to {url}: {e}")
             raise
 
-    def get_deal_links(self, search_term: str, zip_code: str) -> List[str]:
+    async def get_deal_links(self, search_term: str, zip_code: str) -> List[str]:
         """Get all deal links from search results."""
         try:
-            base_url = "https://www.groupon.com/search"
+            base_url = f"{self.BASE_URL}/search"
             url = f"{base_url}?query={search_term}&address={zip_code}"
-            print(f"\nSearching for deals at: {url}")
+            logger.info(f"Searching for deals at: {url}")
             
-            html_content = self.make_request(url)
-            print(f"\nParsing HTML content (length: {len(html_content)})")
+            html_content = await self.make_request(url)
+            logger.debug(f"Parsing HTML content (length: {len(html_content)})")
             
-            soup = BeautifulSoup(html_content, 'html.parser')
+            tree = LexborHTMLParser(html_content)
             
             # Print page title and basic info
-            print(f"\nPage Title: {soup.title.string if soup.title else 'No title found'}")
+            title = tree.css_first('title')
+            logger.debug(f"Page Title: {title.text() if title else 'No title found'}")
             
-            # Debug: Print all links
-            print("\nAll links found in the page:")
-            all_links = soup.find_all('a', href=True)
-            print(f"Total links found: {len(all_links)}")
-            for link in all_links:
-                print(f"Link: {link['href']}")
-            
-            # Debug: Look for common elements
-            print("\nCommon page elements:")
-            print(f"<figure> elements: {len(soup.find_all('figure'))}")
-            print(f"Elements with 'deal' in class: {len(soup.find_all(class_=re.compile('deal')))}")
-            print(f"Elements with 'card' in class: {len(soup.find_all(class_=re.compile('card')))}")
+            # Dump the page structure only when debugging; it costs extra DOM walks
+            if logger.isEnabledFor(logging.DEBUG):
+                all_links = tree.css('a[href]')
+                logger.debug(f"Total links found: {len(all_links)}")
+                for link in all_links:
+                    logger.debug(f"Link: {link.attributes['href']}")
+                
+                logger.debug(f"<figure> elements: {len(tree.css('figure'))}")
+                logger.debug(f"Elements with 'deal' in class: {len(tree.css('[class*=deal]'))}")
+                logger.debug(f"Elements with 'card' in class: {len(tree.css('[class*=card]'))}")
             
-            links = []
-            link_selectors = [
-                "a[href*='/deals/']",
-                "figure.card-ui a",
-                "div.deal-card a",
-                "[data-bhw='DealCard'] a",
-                "a[href*='groupon.com/deals']",
-                ".deal a",
-                ".card a"
-            ]
+            # A dict keeps the links in page order and dedupes them in O(1)
+            links = {}
+            logger.debug(f"Trying selector: {_LINK_SELECTOR}")
+            found_elements = tree.css(_LINK_SELECTOR)
+            logger.debug(f"Found {len(found_elements)} elements")
             
-            for selector in link_selectors:
-                print(f"\nTrying selector: {selector}")
-                found_elements = soup.select(selector)
-                print(f"Found {len(found_elements)} elements")
-                
-                for link in found_elements:
-                    href = link.get('href', '')
-                    print(f"Processing href: {href}")
-                    if '/deals/' in href and not href.endswith('/deals/'):
-                        full_url = f"https://www.groupon.com{href}" if href.startswith('/') else href
-                        if full_url not in links:
-                            links.append(full_url)
-                            print(f"Added deal link: {full_url}")
+            for link in found_elements:
+                href = link.attributes.get('href') or ''
+                logger.debug(f"Processing href: {href}")
+                full_url = _canon(href, self.BASE_URL)
+                if full_url and full_url not in links:
+                    links[full_url] = None
+                    logger.debug(f"Added deal link: {full_url}")
             
-            print(f"\nTotal deal links found: {len(links)}")
-            return links
+            logger.info(f"Total deal links found: {len(links)}")
+            return list(links)
             
         except Exception as e:
-            print(f"Error getting deal links: {str(e)}")
-            print("Full error details:")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error getting deal links: {e}")
             return []
 
-    def scrape_deals(self, search_term: str, zip_code: str) -> List[Dict]:
-        """Get all deals with detailed information."""
+    async def get_deal_details(self, url: str, search_term: str, zip_code: str) -> Optional[Dict]:
+        """Get detailed information from a deal page."""
+        async with self.semaphore:
+            try:
+                logger.debug(f"Processing deal: {url}")
+                html_content = await self.make_request(url)
+                tree = LexborHTMLParser(html_content)
+                
+                deal_data = {
+                    "url": url,
+                    "zip_code": zip_code,
+                    "search_term": search_term,
+                    "timestamp": time.time()
+                }
+                
+                # Read every field and price option in a single pass over the page
+                deal_data.update(_extract(tree.css(_DETAIL_SELECTOR), _DETAIL_FIELDS))
+                for field in _DETAIL_FIELDS:
+                    if field in deal_data:
+                        logger.debug(f"Found {field}: {deal_data[field]}")
+                
+                logger.info(f"Successfully processed deal: {url}")
+                return deal_data
+                
+            except Exception as e:
+                logger.exception(f"Error processing deal {url}: {e}")
+                return None
+
+    async def scrape_deals(self, search_term: str, zip_code: str) -> AsyncIterator[Dict]:
+        """Yield deals with detailed information as soon as each one is scraped."""
         try:
-            print(f"\nScraping deals for search term '{search_term}' in ZIP code {zip_code}")
-            deals = []
+            logger.info(f"Scraping deals for search term '{search_term}' in ZIP code {zip_code}")
             
             # Get all deal links first
-            links = self.get_deal_links(search_term, zip_code)
-            print(f"Found {len(links)} links to process")
+            links = await self.get_deal_links(search_term, zip_code)
+            logger.info(f"Found {len(links)} links to process")
             
-            # Process each link
-            for link in links:
-                try:
-                    print(f"\nProcessing deal: {link}")
-                    html_content = self.make_request(link)
-                    soup = BeautifulSoup(html_content, 'html.parser')
-                    
-                    deal_data = {
-                        "url": link,
-                        "zip_code": zip_code,
-                        "search_term": search_term,
-                        "timestamp": time.time()
-                    }
-                    
-                    # Get deal title
-                    title = soup.find(["h1", "h2"], class_=lambda x: x and "deal-title" in x.lower())
-                    if title:
-                        deal_data["title"] = title.get_text(strip=True)
-                        print(f"Found title: {deal_data['title']}")
-                    
-                    # Get merchant name
-                    merchant = soup.find(class_=lambda x: x and "merchant-name" in x.lower())
-                    if merchant:
-                        deal_data["merchant"] = merchant.get_text(strip=True)
-                        print(f"Found merchant: {deal_data['merchant']}")
-                    
-                    # Get price information
-                    price_options = []
-                    for option in soup.find_all(class_=lambda x: x and "deal-option" in x.lower()):
-                        option_data = {}
-                        
-                        # Get original price
-                        original_price = option.find(class_=lambda x: x and "original-price" in x.lower())
-                        if original_price:
-                            option_data["original_price"] = original_price.get_text(strip=True)
-                        
-                        # Get current price
-                        current_price = option.find(class_=lambda x: x and "current-price" in x.lower())
-                        if current_price:
-                            option_data["current_price"] = current_price.get_text(strip=True)
-                        
-                        if option_data:
-                            price_options.append(option_data)
-                            print(f"Found price option: {option_data}")
-                    
-                    if price_options:
-                        deal_data["price_options"] = price_options
-                    
-                    # Get deal highlights
-                    highlights = soup.find(class_=lambda x: x and "highlights" in x.lower())
-                    if highlights:
-                        deal_data["highlights"] = [
-                            item.get_text(strip=True)
-                            for item in highlights.find_all("li")
-                        ]
-                        print(f"Found {len(deal_data['highlights'])} highlights")
-                    
-                    # Get fine print
-                    fine_print = soup.find(class_=lambda x: x and "fine-print" in x.lower())
-                    if fine_print:
-                        deal_data["fine_print"] = fine_print.get_text(strip=True)
-                        print("Found fine print information")
-                    
-                    deals.append(deal_data)
-                    print(f"Successfully processed deal: {link}")
-                    
-                    # Add a delay between processing deals
-                    delay = random.uniform(2, 5)
-                    print(f"Waiting {delay:.2f} seconds before next deal...")
-                    time.sleep(delay)
-                    
-                except Exception as e:
-                    print(f"Error processing deal {link}: {str(e)}")
-                    print("Full error details:")
-                    import traceback
-                    traceback.print_exc()
-                    continue
+            # Process the links concurrently, bounded by the semaphore
+            count = 0
+            for task in asyncio.as_completed(
+                [self.get_deal_details(link, search_term, zip_code) for link in links]
+            ):
+                deal = await task
+                if deal:
+                    count += 1
+                    yield deal
             
-            print(f"\nSuccessfully processed {len(deals)} deals for ZIP code {zip_code}")
-            return deals
+            logger.info(f"Successfully processed {count} deals for ZIP code {zip_code}")
             
         except Exception as e:
-            print(f"Error in scrape_deals: {str(e)}")
-            print("Full error details:")
-            import traceback
-            traceback.print_exc()
-            return []
+            logger.exception(f"Error in scrape_deals: {e}")
 
-def main():
+async def write_deals(queue: asyncio.Queue, path: Path) -> int:
+    """Append deals from the queue to a JSON Lines file until None is received."""
+    count = 0
+    with open(path, "wb") as f:
+        while (deal := await queue.get()) is not None:
+            f.write(orjson.dumps(deal) + b"\n")
+            f.flush()
+            count += 1
+    return count
+
+async def main():
     """Main entry point."""
     try:
-        print("\n=== Starting Groupon Scraper ===\n")
+        logger.info("Starting Groupon Scraper")
         
         # Read zip codes
         with open("zipcodes.txt", "r") as f:
@@ -288,38 +450,44 @@ def main():
         if not zip_codes:
             raise ValueError("No ZIP codes found in zipcodes.txt")
         
-        print(f"Loaded {len(zip_codes)} ZIP codes")
+        logger.info(f"Loaded {len(zip_codes)} ZIP codes")
         
         search_term = "Hydrafacial"
-        print(f"\nSearch term: {search_term}")
-        
-        scraper = GrouponScraper()
-        all_deals = []
+        logger.info(f"Search term: {search_term}")
         
-        # Scrape deals for each zip code
-        for zip_code in zip_codes:
-            print(f"\nProcessing ZIP code: {zip_code}")
-            deals = scraper.scrape_deals(search_term, zip_code)
-            all_deals.extend(deals)
-            time.sleep(random.uniform(10, 15))
-        
-        # Save results
         output_dir = Path("output")
         output_dir.mkdir(exist_ok=True)
+        jsonl_file = output_dir / "deals.jsonl"
         output_file = output_dir / "deals.json"
         
-        with open(output_file, "w", encoding='utf-8') as f:
-            json.dump(all_deals, f, indent=2, ensure_ascii=False)
+        # A single writer task appends each deal to disk as soon as it is scraped
+        queue: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(write_deals(queue, jsonl_file))
+        
+        async with GrouponScraper() as scraper:
+            zip_semaphore = asyncio.Semaphore(MAX_PARALLEL_ZIPS)
+            
+            async def scrape_zip(zip_code: str):
+                async with zip_semaphore:
+                    logger.info(f"Processing ZIP code: {zip_code}")
+                    async for deal in scraper.scrape_deals(search_term, zip_code):
+                        await queue.put(deal)
+            
+            # Scrape the zip codes concurrently; requests share the scraper's semaphore and rate limit
+            await asyncio.gather(*(scrape_zip(zip_code) for zip_code in zip_codes))
+        
+        await queue.put(None)
+        total = await writer
+        logger.info(f"Found total {total} deals")
+        logger.info(f"Results streamed to: {jsonl_file}")
         
-        print(f"\nFound total {len(all_deals)} deals")
-        print(f"Results saved to: {output_file}")
+        # Keep the JSON array output for existing consumers
+        jsonl_to_json(jsonl_file, output_file)
+        logger.info(f"Results saved to: {output_file}")
         
     except Exception as e:
-        print(f"\nError in main: {str(e)}")
-        print("Full error details:")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in main: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
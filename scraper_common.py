@@ -0,0 +1,49 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+class ResponseCache:
+    """On-disk cache of successful response bodies, keyed by URL."""
+
+    def __init__(self, directory: Path, expire_after: float):
+        self.directory = directory
+        self.expire_after = expire_after
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha1(url.encode()).hexdigest()}.html"
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Return the cached body for url, or None if missing or expired."""
+        path = self._path(url)
+        try:
+            if time.time() - path.stat().st_mtime < self.expire_after:
+                return path.read_bytes()
+        except FileNotFoundError:
+            pass
+        return None
+
+    def set(self, url: str, content: bytes):
+        """Store the body for url, replacing any previous entry atomically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        # A unique temp file per write, so concurrent writers (threads or worker
+        # processes) never interleave into the same file before the rename
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        Path(tmp_name).replace(path)
+
+def jsonl_to_json(src: Path, dst: Path):
+    """Rewrite a JSON Lines file as a JSON array, one record at a time."""
+    with open(src, "rb") as f_in, open(dst, "wb") as f_out:
+        separator = b"[\n"
+        for line in f_in:
+            f_out.write(separator)
+            f_out.write(orjson.dumps(orjson.loads(line), option=orjson.OPT_INDENT_2))
+            separator = b",\n"
+        f_out.write(b"[]" if separator == b"[\n" else b"\n]")
@@ -1,18 +1,32 @@
-import json
+import asyncio
+import orjson
 import logging
 import time
 from pathlib import Path
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import base64
 import random
+import multiprocessing.util
+import shutil
+import tempfile
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from functools import lru_cache
+import re
+import aiohttp
+import psutil
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from lxml import etree
+from scraper_common import ResponseCache, jsonl_to_json
 from tqdm import tqdm
 import os
 import platform
-import subprocess
+import queue
+import threading
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # Configure logging
@@ -28,6 +42,70 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bound each chromedriver command instead of waiting on the global socket default
+RemoteConnection.set_timeout(60)
+
+# Headers for plain HTTP requests, matching a regular desktop Chrome
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# Deal page hrefs, relative or on www.groupon.com; group 1 is the path without query, fragment or trailing slash
+DEAL_HREF_RE = re.compile(r'^(?:https?://www\.groupon\.com)?(/deals/[^?#]*[^/?#])/?(?:[?#]|$)')
+
+# Every real deal page carries one of these classes; pages without them aren't worth parsing
+DEAL_CONTENT_RE = re.compile('deal-title|deal-option', re.IGNORECASE)
+
+# Class substrings (matched case-insensitively) for the deal page fields
+DEAL_FIELDS = {
+    'title': 'deal-title',
+    'merchant': 'merchant-name',
+    'location': 'merchant-location',
+    'fine_print': 'fine-print',
+    'description': 'description',
+}
+TITLE_TAGS = ('h1', 'h2')
+OPTION_CLASS = 'deal-option'
+OPTION_FIELDS = {
+    'title': 'option-title',
+    'original_price': 'original-price',
+    'current_price': 'current-price',
+    'discount': 'discount',
+    'bought': 'bought',
+}
+HIGHLIGHTS_CLASS = 'highlights'
+# Elements whose content is code or markup, never visible text
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+# Status codes and page markers that mean Groupon served a bot check instead of content
+BLOCKED_STATUSES = (403, 429, 503)
+CHALLENGE_MARKERS = ('px-captcha', 'cf-chl', 'challenge-platform', '<title>access denied</title>')
+
+# Fetched pages are reused from disk for this many seconds
+CACHE_DIR = log_dir / "http-cache"
+CACHE_TTL = 600
+
+# Groupon's search page loads its deal cards from a JSON endpoint; a one-time browser
+# probe looks for it and saves the result here, trusted for ENDPOINT_TTL seconds
+ENDPOINT_FILE = log_dir / "search-endpoint.json"
+ENDPOINT_TTL = 24 * 3600
+
+# Prefix of the temporary Chrome profile each browser gets
+PROFILE_PREFIX = 'uc-profile-'
+
+# Resource URL patterns the browser never downloads
+BLOCKED_RESOURCES = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.css',
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*', '*facebook*',
+]
+
+# ZIP codes scraped in parallel, each worker process with its own browser
+MAX_WORKERS = 4
+
 def is_wsl() -> bool:
     """Check if running in WSL."""
     return platform.system() == 'Linux' and 'microsoft' in platform.uname().release.lower()
@@ -45,11 +123,252 @@ def get_windows_chrome_path() -> str:
     
     raise FileNotFoundError("Could not find Chrome installation in Windows. Please install Chrome or provide correct path.")
 
+def kill_own_chrome():
+    """Kill Chrome processes started by this process, leaving other workers' browsers alone."""
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if 'chrome' in child.name().lower():
+                child.kill()
+        except psutil.Error:
+            pass
+
+@lru_cache(maxsize=1)
+def _cleanup_once():
+    """Kill Chrome left running by earlier crashed runs, at most once per process."""
+    # Only orphaned browsers on one of our profiles match, so the user's own
+    # Chrome windows and the browsers of running workers are left alone
+    profile_flag = f"--user-data-dir={os.path.join(tempfile.gettempdir(), PROFILE_PREFIX)}"
+    for proc in psutil.process_iter(['name', 'cmdline', 'ppid']):
+        try:
+            if 'chrome' not in (proc.info['name'] or '').lower():
+                continue
+            if not any(arg.startswith(profile_flag) for arg in proc.info['cmdline'] or ()):
+                continue
+            if proc.info['ppid'] == 1 or not psutil.pid_exists(proc.info['ppid']):
+                proc.kill()
+                logger.info(f"Killed leftover Chrome process {proc.pid}")
+        except psutil.Error:
+            pass
+
+def search_url(search_term: str, zip_code: str) -> str:
+    """Build the search results URL with the term and ZIP code properly encoded."""
+    return "https://www.groupon.com/search?" + urlencode({'query': search_term, 'address': zip_code})
+
+def is_challenge(page_source: str) -> bool:
+    """Check if a page is a bot check rather than real content."""
+    lowered = page_source.lower()
+    return any(marker in lowered for marker in CHALLENGE_MARKERS)
+
+def deal_links(hrefs) -> List[str]:
+    """Normalize deal page hrefs to absolute URLs, deduped in order."""
+    # Match every href in C, then dedupe in order; image and title anchors point at the same deal
+    matches = filter(None, map(DEAL_HREF_RE.match, hrefs))
+    links = list(dict.fromkeys(f"https://www.groupon.com{match.group(1)}" for match in matches))
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        for link in links:
+            logger.debug(f"Found deal link: {link}")
+    
+    return links
+
+def parse_deal_links(page_source: str) -> List[str]:
+    """Extract deal page URLs from a search results page."""
+    tree = etree.HTML(page_source)
+    if tree is None:
+        return []
+    return deal_links(tree.xpath('//a/@href'))
+
+def iter_strings(value):
+    """Yield every string nested anywhere in a decoded JSON value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+
+def parse_deal_links_json(body: bytes) -> List[str]:
+    """Extract deal page URLs from a search endpoint response, whatever its layout."""
+    return deal_links(iter_strings(orjson.loads(body)))
+
+def search_endpoint_candidates(performance_log: List[Dict]) -> List[tuple]:
+    """List (request id, URL) of the JSON XHR/fetch responses from groupon.com in a browser's network events."""
+    candidates = []
+    for entry in performance_log:
+        message = orjson.loads(entry['message'])['message']
+        if message.get('method') != 'Network.responseReceived':
+            continue
+        params = message['params']
+        response = params['response']
+        if params.get('type') not in ('XHR', 'Fetch'):
+            continue
+        if not response.get('mimeType', '').startswith('application/json'):
+            continue
+        host = urlsplit(response.get('url', '')).hostname or ''
+        if host == 'groupon.com' or host.endswith('.groupon.com'):
+            candidates.append((params['requestId'], response['url']))
+    return candidates
+
+def endpoint_template(url: str, search_term: str, zip_code: str) -> Optional[Dict]:
+    """Describe a captured request as a reusable endpoint, or None unless its query carries both the term and ZIP code."""
+    parts = urlsplit(url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    term_param = next((key for key, value in params if value.lower() == search_term.lower()), None)
+    zip_param = next((key for key, value in params if value == zip_code), None)
+    if term_param is None or zip_param is None or term_param == zip_param:
+        return None
+    return {
+        "url": urlunsplit(parts._replace(query='', fragment='')),
+        "params": params,
+        "term_param": term_param,
+        "zip_param": zip_param,
+    }
+
+def endpoint_params(endpoint: Dict, search_term: str, zip_code: str) -> List[tuple]:
+    """Rebuild the captured query with this search term and ZIP code in the parameters that carried them."""
+    params = []
+    for key, value in endpoint["params"]:
+        if key == endpoint["term_param"]:
+            value = search_term
+        elif key == endpoint["zip_param"]:
+            value = zip_code
+        params.append((key, value))
+    return params
+
+def load_search_endpoint() -> Optional[Dict]:
+    """Return the saved probe result, or None if there is none younger than ENDPOINT_TTL."""
+    # A result whose "url" is None records a probe that found no usable endpoint
+    try:
+        if time.time() - ENDPOINT_FILE.stat().st_mtime < ENDPOINT_TTL:
+            return orjson.loads(ENDPOINT_FILE.read_bytes())
+    except FileNotFoundError:
+        pass
+    return None
+
+def save_search_endpoint(endpoint: Dict):
+    """Save a probe result for later runs, replacing any previous one atomically."""
+    tmp_path = ENDPOINT_FILE.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(orjson.dumps(endpoint))
+    tmp_path.replace(ENDPOINT_FILE)
+
+def collapse_text(parts: List[str]) -> str:
+    """Join an element's text nodes, collapsing whitespace runs to single spaces."""
+    return ' '.join(''.join(parts).split())
+
+class DealExtractor:
+    """lxml parser target that collects deal fields from parse events without building a tree."""
+    
+    def __init__(self):
+        self.depth = 0
+        # Number of open script/style/template elements; their text is skipped
+        self.non_text = 0
+        self.deal_data: Dict = {}
+        self.options: List[Dict] = []
+        self.highlights: Optional[List[str]] = None
+        self.highlights_depth: Optional[int] = None
+        # Elements whose text is being collected: [depth, text parts, dict to store into, key]
+        self.captures: List[list] = []
+        # Price options still open: (depth, option data)
+        self.open_options: List[tuple] = []
+    
+    def _capture(self, target: Dict, key: str):
+        target[key] = None  # Claimed, so later matches are skipped
+        self.captures.append([self.depth, [], target, key])
+    
+    def start(self, tag, attrib):
+        self.depth += 1
+        if tag in NON_TEXT_TAGS:
+            self.non_text += 1
+        classes = attrib.get('class', '').lower()
+        
+        if classes:
+            for key, class_name in DEAL_FIELDS.items():
+                if key not in self.deal_data and class_name in classes:
+                    if key != 'title' or tag in TITLE_TAGS:
+                        self._capture(self.deal_data, key)
+            
+            # Fields of the price options this element sits inside
+            for _, option_data in self.open_options:
+                for key, class_name in OPTION_FIELDS.items():
+                    if key not in option_data and class_name in classes:
+                        self._capture(option_data, key)
+            
+            if OPTION_CLASS in classes:
+                option_data = {}
+                self.options.append(option_data)
+                self.open_options.append((self.depth, option_data))
+            
+            if self.highlights is None and HIGHLIGHTS_CLASS in classes:
+                self.highlights = []
+                self.highlights_depth = self.depth
+        
+        if tag == 'li' and self.highlights_depth is not None:
+            self.highlights.append(None)
+            self._capture(self.highlights, len(self.highlights) - 1)
+    
+    def data(self, text):
+        if self.non_text:
+            return
+        for capture in self.captures:
+            capture[1].append(text)
+    
+    def end(self, tag):
+        if tag in NON_TEXT_TAGS:
+            self.non_text -= 1
+        # Finish every capture and container opened at this depth
+        while self.captures and self.captures[-1][0] == self.depth:
+            _, parts, target, key = self.captures.pop()
+            target[key] = collapse_text(parts)
+        while self.open_options and self.open_options[-1][0] == self.depth:
+            self.open_options.pop()
+        if self.highlights_depth == self.depth:
+            self.highlights_depth = None
+        self.depth -= 1
+    
+    def close(self) -> Dict:
+        # Unclosed elements at end of document still keep the text seen so far
+        for _, parts, target, key in self.captures:
+            target[key] = collapse_text(parts)
+        
+        deal_data = {key: value for key, value in self.deal_data.items() if value is not None}
+        options = [option for option in self.options if option]
+        if options:
+            deal_data["options"] = options
+        if self.highlights is not None:
+            deal_data["highlights"] = self.highlights
+        return deal_data
+
+def parse_deal_details(url: str, page_source: str) -> Dict:
+    """Extract deal information from a deal page."""
+    # Interstitials and empty pages would yield no fields, so skip the parse entirely
+    if not DEAL_CONTENT_RE.search(page_source):
+        logger.warning(f"No deal content on page: {url}")
+        return {"url": url, "error": "no-content"}
+    
+    parser = etree.HTMLParser(target=DealExtractor())
+    parser.feed(page_source)
+    deal_data = {
+        "url": url,
+        "timestamp": time.time(),
+        **parser.close()
+    }
+    if "title" in deal_data:
+        logger.info(f"Found deal title: {deal_data['title']}")
+    
+    return deal_data
+
 class GrouponScraper:
     """Scraper for Groupon deals with detailed information."""
     
-    def __init__(self):
+    # Wait conditions are built once and shared by every page load
+    _DEAL_CARD_COND = EC.presence_of_element_located((By.CSS_SELECTOR, "figure.card-ui, div.deal-card"))
+    _DEAL_TITLE_COND = EC.presence_of_element_located((By.CSS_SELECTOR, "h1, h2.deal-title"))
+    
+    def __init__(self, record_network: bool = False):
         logger.info("Initializing GrouponScraper...")
+        self.cache = ResponseCache(CACHE_DIR, CACHE_TTL)
         
         # Configure Chrome options
         options = uc.ChromeOptions()
@@ -57,6 +376,17 @@ class GrouponScraper:
         # Basic options
         options.add_argument('--start-maximized')
         options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        # Run the network service inside the browser process to save an IPC hop per request
+        options.add_argument('--enable-features=NetworkServiceInProcess')
+        
+        # Own profile per browser so several can run side by side without fighting over its lock
+        self._profile = tempfile.mkdtemp(prefix=PROFILE_PREFIX)
+        options.add_argument(f'--user-data-dir={self._profile}')
+        
+        # Only the endpoint probe records network events; other browsers skip the overhead
+        if record_network:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         
         # WSL specific options
         if is_wsl():
@@ -72,19 +402,11 @@ class GrouponScraper:
             options.add_argument('--disable-software-rasterizer')
             options.add_argument('--disable-features=VizDisplayCompositor')
             options.add_argument('--disable-extensions')
-            options.add_argument('--remote-debugging-port=9222')
             options.add_argument('--window-size=1920,1080')
             
             # Additional preferences
             options.add_experimental_option('excludeSwitches', ['enable-automation'])
             options.add_experimental_option('useAutomationExtension', False)
-            
-            # Try to kill any existing Chrome processes
-            try:
-                subprocess.run(['pkill', 'chrome'], stderr=subprocess.DEVNULL)
-                logger.info("Killed existing Chrome processes")
-            except Exception as e:
-                logger.warning(f"Failed to kill existing Chrome processes: {e}")
         
         # Initialize undetected-chromedriver
         try:
@@ -100,6 +422,13 @@ class GrouponScraper:
             self.wait = WebDriverWait(self.driver, 20)
             logger.info("Chrome driver created successfully")
             
+            # Skip imagery, fonts, stylesheets and trackers the scraper never reads
+            try:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCES})
+            except WebDriverException as e:
+                logger.warning(f"Failed to block page resources: {e}")
+            
             # Test the connection
             self.driver.get('https://www.groupon.com')
             logger.info("Successfully loaded Groupon homepage")
@@ -107,9 +436,10 @@ class GrouponScraper:
             
         except Exception as e:
             logger.error(f"Failed to create Chrome driver: {e}")
+            shutil.rmtree(self._profile, ignore_errors=True)
             raise
     
-    def __del__(self):
+    def close(self):
         """Clean up browser instance."""
         try:
             if hasattr(self, 'driver'):
@@ -118,47 +448,84 @@ class GrouponScraper:
                 logger.info("Chrome driver closed successfully")
         except Exception as e:
             logger.error(f"Error closing Chrome driver: {e}")
+        shutil.rmtree(self._profile, ignore_errors=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def reset(self) -> bool:
+        """Blank the current page so the next user starts from a clean tab; False if the driver is gone."""
+        try:
+            self.driver.get('about:blank')
+            return True
+        except Exception as e:
+            # Selenium passes urllib3 errors (dead chromedriver, read timeouts) through unwrapped
+            logger.warning(f"Failed to reset Chrome driver: {e}")
+            return False
     
-    def random_delay(self):
-        """Add random delay between actions."""
-        delay = random.uniform(2, 5)
-        logger.debug(f"Waiting for {delay:.2f} seconds...")
+    def probe_search_endpoint(self, search_term: str, zip_code: str) -> Optional[Dict]:
+        """Load a search page and return the JSON endpoint behind its deal cards, if one checks out."""
+        # Needs record_network=True. A candidate is only accepted when its response, read
+        # back from the same page load, lists some of the deals the rendered page links to
+        self.driver.get(search_url(search_term, zip_code))
+        try:
+            self.wait_for(self._DEAL_CARD_COND)
+        except TimeoutException:
+            logger.warning("Timeout waiting for deal cards, checking page source anyway...")
+        
+        html_links = set(parse_deal_links(self.driver.page_source))
+        if not html_links:
+            logger.warning("Search page has no deal links to check the endpoint against")
+            return None
+        
+        for request_id, url in search_endpoint_candidates(self.driver.get_log('performance')):
+            endpoint = endpoint_template(url, search_term, zip_code)
+            if endpoint is None:
+                continue
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                content = base64.b64decode(body['body']) if body.get('base64Encoded') else body['body'].encode('utf-8')
+                links = parse_deal_links_json(content)
+            except (WebDriverException, orjson.JSONDecodeError) as e:
+                logger.debug(f"Skipping endpoint candidate {url}: {e}")
+                continue
+            if html_links.intersection(links):
+                return endpoint
+        return None
+    
+    def wait_for(self, cond, jitter=(0.1, 0.4)):
+        """Wait until cond holds, then pause briefly so requests aren't perfectly regular."""
+        self.wait.until(cond)
+        delay = random.uniform(*jitter)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Waiting for {delay:.2f} seconds...")
         time.sleep(delay)
     
     def get_deal_links(self, search_term: str, zip_code: str) -> List[str]:
         """Get all deal links from search results."""
         try:
             # Build search URL
-            url = f"https://www.groupon.com/search?query={search_term}&address={zip_code}"
+            url = search_url(search_term, zip_code)
             logger.info(f"Accessing search URL: {url}")
             
             # Load the page
             self.driver.get(url)
             logger.info("Page loaded, waiting for content...")
-            self.random_delay()
             
             try:
                 # Wait for deal cards to load
                 logger.info("Waiting for deal cards to appear...")
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "figure.card-ui, div.deal-card")))
+                self.wait_for(self._DEAL_CARD_COND)
                 logger.info("Deal cards found")
             except TimeoutException:
                 logger.warning("Timeout waiting for deal cards, checking page source anyway...")
             
-            # Get page source and parse with BeautifulSoup
             page_source = self.driver.page_source
             logger.info(f"Page source length: {len(page_source)} characters")
-            soup = BeautifulSoup(page_source, 'html.parser')
-            links = []
-            
-            # Find all deal links
-            for link in soup.find_all("a", href=True):
-                href = link.get('href', '')
-                if '/deals/' in href and not href.endswith('/deals/'):
-                    full_url = f"https://www.groupon.com{href}" if href.startswith('/') else href
-                    if full_url not in links:
-                        links.append(full_url)
-                        logger.debug(f"Found deal link: {full_url}")
+            links = parse_deal_links(page_source)
             
             logger.info(f"Found {len(links)} deal links")
             return links
@@ -175,97 +542,28 @@ class GrouponScraper:
         try:
             logger.info(f"Scraping deal: {url}")
             
+            cached = self.cache.get(url)
+            if cached is not None:
+                logger.info(f"Using cached deal page: {url}")
+                return parse_deal_details(url, cached.decode('utf-8'))
+            
             # Load the deal page
             self.driver.get(url)
             logger.info("Deal page loaded, waiting for content...")
-            self.random_delay()
             
             try:
                 # Wait for main content to load
                 logger.info("Waiting for deal title to appear...")
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1, h2.deal-title")))
+                self.wait_for(self._DEAL_TITLE_COND)
                 logger.info("Deal title found")
             except TimeoutException:
                 logger.warning("Timeout waiting for deal title, checking page source anyway...")
             
-            # Parse with BeautifulSoup
             page_source = self.driver.page_source
             logger.info(f"Deal page source length: {len(page_source)} characters")
-            soup = BeautifulSoup(page_source, 'html.parser')
-            deal_data = {
-                "url": url,
-                "timestamp": time.time()
-            }
-            
-            # Get deal title
-            title = soup.find(["h1", "h2"], class_=lambda x: x and "deal-title" in x.lower())
-            if title:
-                deal_data["title"] = title.get_text(strip=True)
-                logger.info(f"Found deal title: {deal_data['title']}")
-            
-            # Get merchant info
-            merchant = soup.find(class_=lambda x: x and "merchant-name" in x.lower())
-            if merchant:
-                deal_data["merchant"] = merchant.get_text(strip=True)
-            
-            # Get location/address
-            location = soup.find(class_=lambda x: x and "merchant-location" in x.lower())
-            if location:
-                deal_data["location"] = location.get_text(strip=True)
-            
-            # Get price options
-            options = []
-            for option in soup.find_all(class_=lambda x: x and "deal-option" in x.lower()):
-                option_data = {}
-                
-                # Option title
-                option_title = option.find(class_=lambda x: x and "option-title" in x.lower())
-                if option_title:
-                    option_data["title"] = option_title.get_text(strip=True)
-                
-                # Prices
-                original = option.find(class_=lambda x: x and "original-price" in x.lower())
-                if original:
-                    option_data["original_price"] = original.get_text(strip=True)
-                
-                current = option.find(class_=lambda x: x and "current-price" in x.lower())
-                if current:
-                    option_data["current_price"] = current.get_text(strip=True)
-                
-                discount = option.find(class_=lambda x: x and "discount" in x.lower())
-                if discount:
-                    option_data["discount"] = discount.get_text(strip=True)
-                
-                # Number bought
-                bought = option.find(class_=lambda x: x and "bought" in x.lower())
-                if bought:
-                    option_data["bought"] = bought.get_text(strip=True)
-                
-                if option_data:
-                    options.append(option_data)
-            
-            if options:
-                deal_data["options"] = options
-            
-            # Get fine print
-            fine_print = soup.find(class_=lambda x: x and "fine-print" in x.lower())
-            if fine_print:
-                deal_data["fine_print"] = fine_print.get_text(strip=True)
-            
-            # Get highlights
-            highlights = soup.find(class_=lambda x: x and "highlights" in x.lower())
-            if highlights:
-                deal_data["highlights"] = [
-                    li.get_text(strip=True) 
-                    for li in highlights.find_all("li")
-                ]
-            
-            # Get description
-            description = soup.find(class_=lambda x: x and "description" in x.lower())
-            if description:
-                deal_data["description"] = description.get_text(strip=True)
-            
-            return deal_data
+            if DEAL_CONTENT_RE.search(page_source):
+                self.cache.set(url, page_source.encode('utf-8'))
+            return parse_deal_details(url, page_source)
             
         except WebDriverException as e:
             logger.error(f"WebDriver error getting deal details from {url}: {e}")
@@ -273,26 +571,255 @@ class GrouponScraper:
         except Exception as e:
             logger.error(f"Error getting deal details from {url}: {e}")
             return {"url": url, "error": str(e)}
+
+class DriverPool:
+    """Fixed-size pool of GrouponScraper browsers, started on demand and reused between pages."""
+    
+    def __init__(self, size: int = 1):
+        self.size = size
+        self.idle: queue.Queue = queue.Queue()
+        self.browsers: List[GrouponScraper] = []
+        self.error: Optional[Exception] = None
+        self.lock = threading.Lock()
+    
+    def get(self) -> GrouponScraper:
+        """Take an idle browser, starting a new one while the pool is below size."""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self.lock:
+            # Don't retry a browser that failed to start on every blocked page
+            if len(self.browsers) < self.size and self.error is None:
+                try:
+                    browser = GrouponScraper()
+                except Exception as e:
+                    self.error = e
+                else:
+                    self.browsers.append(browser)
+                    return browser
+            if not self.browsers:
+                raise RuntimeError(f"Browser fallback unavailable: {self.error}")
+        
+        # Every browser is busy; wait for one to be handed back
+        return self.idle.get()
+    
+    def put(self, browser: GrouponScraper):
+        """Hand a browser back, refreshed to a blank page instead of quit."""
+        if browser.reset():
+            self.idle.put(browser)
+            return
+        # A browser that can't reset is dropped, freeing its slot for get() to start a new one
+        with self.lock:
+            self.browsers.remove(browser)
+        browser.close()
+    
+    def close(self):
+        """Quit every browser the pool started."""
+        for browser in self.browsers:
+            browser.close()
+        self.browsers.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class AsyncGrouponScraper:
+    """Scraper that fetches Groupon pages over plain HTTP and only starts a browser when blocked."""
+    
+    def __init__(self, max_concurrency: int = 10, pool: Optional[DriverPool] = None, pool_size: int = 1):
+        # Deal pages are fetched concurrently, at most max_concurrency at a time
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.cache = ResponseCache(CACHE_DIR, CACHE_TTL)
+        self.search_endpoint = load_search_endpoint()
+        
+        # Browser fallback, started on the first blocked request and reused after that.
+        # Callers queue for a browser here, on the event loop, so no executor
+        # thread is ever parked waiting on the pool
+        # A pool passed in outlives this scraper and is closed by its owner
+        self.owns_pool = pool is None
+        self.pool = DriverPool(pool_size) if pool is None else pool
+        self.browser_slots = asyncio.Semaphore(self.pool.size)
+    
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            headers=HTTP_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        if self.owns_pool:
+            await asyncio.to_thread(self.pool.close)
+    
+    async def _fetch(self, url: str, deal_page: bool = False) -> Optional[str]:
+        """Fetch a page over HTTP, returning None when Groupon serves a block or challenge page."""
+        cached = await asyncio.to_thread(self.cache.get, url)
+        if cached is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Using cached page: {url}")
+            return cached.decode('utf-8', errors='replace')
+        
+        try:
+            async with self.session.get(url) as response:
+                if response.status in BLOCKED_STATUSES:
+                    logger.warning(f"HTTP request to {url} blocked with status {response.status}")
+                    return None
+                response.raise_for_status()
+                # A stray byte that doesn't match the declared charset shouldn't lose the page
+                page_source = await response.text(errors='replace')
+                cache_control = response.headers.get('Cache-Control', '').lower()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"HTTP request to {url} failed: {e}")
+            return None
+        
+        if is_challenge(page_source):
+            logger.warning(f"Challenge page returned for {url}")
+            return None
+        # A 200 deal page without any deal markup is a soft block
+        if deal_page and not DEAL_CONTENT_RE.search(page_source):
+            logger.warning(f"No deal content returned for {url}")
+            return None
+        
+        # Pages Groupon marks as uncacheable are always fetched fresh
+        if 'no-store' not in cache_control:
+            try:
+                await asyncio.to_thread(self.cache.set, url, page_source.encode('utf-8'))
+            except OSError as e:
+                logger.warning(f"Failed to cache {url}: {e}")
+        return page_source
+    
+    async def _with_browser(self, method: str, *args):
+        """Run a GrouponScraper method in a worker thread on a browser borrowed from the pool."""
+        # Each driver can only load one page at a time, so it is held for the whole call
+        async with self.browser_slots:
+            browser = await asyncio.to_thread(self.pool.get)
+            try:
+                return await asyncio.to_thread(getattr(browser, method), *args)
+            finally:
+                await asyncio.to_thread(self.pool.put, browser)
+    
+    async def _fetch_links_json(self, search_term: str, zip_code: str) -> List[str]:
+        """Get deal links straight from the search JSON endpoint, or [] if it isn't usable."""
+        params = endpoint_params(self.search_endpoint, search_term, zip_code)
+        try:
+            async with self.session.get(self.search_endpoint["url"], params=params, headers={'Accept': 'application/json'}) as response:
+                if response.status != 200:
+                    logger.warning(f"Search endpoint returned status {response.status}")
+                    return []
+                body = await response.read()
+            return parse_deal_links_json(body)
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Search endpoint request failed: {e}")
+            return []
+    
+    async def get_deal_links(self, search_term: str, zip_code: str) -> List[str]:
+        """Get all deal links from search results."""
+        # The JSON endpoint skips rendering the search page at all
+        if self.search_endpoint and self.search_endpoint["url"]:
+            links = await self._fetch_links_json(search_term, zip_code)
+            if links:
+                logger.info(f"Found {len(links)} deal links from search endpoint")
+                return links
+        
+        url = search_url(search_term, zip_code)
+        logger.info(f"Fetching search URL: {url}")
+        
+        page_source = await self._fetch(url)
+        if page_source is None:
+            try:
+                return await self._with_browser("get_deal_links", search_term, zip_code)
+            except Exception as e:
+                logger.error(f"Error getting deal links: {e}")
+                return []
+        
+        try:
+            links = parse_deal_links(page_source)
+        except Exception as e:
+            logger.error(f"Error parsing deal links from {url}: {e}")
+            return []
+        logger.info(f"Found {len(links)} deal links")
+        return links
+    
+    async def _fetch_and_parse(self, url: str) -> Dict:
+        """Get detailed information from a deal page."""
+        try:
+            async with self.semaphore:
+                page_source = await self._fetch(url, deal_page=True)
+            if page_source is None:
+                return await self._with_browser("get_deal_details", url)
+            return parse_deal_details(url, page_source)
+        except Exception as e:
+            logger.error(f"Error getting deal details from {url}: {e}")
+            return {"url": url, "error": str(e)}
     
-    def scrape_deals(self, search_term: str, zip_code: str) -> List[Dict]:
-        """Get all deals with detailed information."""
+    async def scrape_deals(self, search_term: str, zip_code: str) -> AsyncIterator[Dict]:
+        """Yield deals with detailed information as each one finishes."""
         # Get all deal links first
-        links = self.get_deal_links(search_term, zip_code)
+        links = await self.get_deal_links(search_term, zip_code)
         if not links:
             logger.warning("No deals found")
-            return []
-        
-        # Get details for each deal
-        deals = []
-        for link in tqdm(links, desc="Scraping deals"):
-            deal_data = self.get_deal_details(link)
-            if deal_data:
-                deal_data["zip_code"] = zip_code
-                deal_data["search_term"] = search_term
-                deals.append(deal_data)
-            self.random_delay()
+            return
         
-        return deals
+        # Get details for all deals concurrently
+        with tqdm(total=len(links), desc="Scraping deals") as progress:
+            for task in asyncio.as_completed([self._fetch_and_parse(link) for link in links]):
+                deal_data = await task
+                progress.update()
+                if deal_data:
+                    deal_data["zip_code"] = zip_code
+                    deal_data["search_term"] = search_term
+                    yield deal_data
+
+def discover_search_endpoint(search_term: str, zip_code: str):
+    """Probe once for the search JSON endpoint with a network-recording browser, unless a recent result is saved."""
+    if load_search_endpoint() is not None:
+        return
+    
+    logger.info("Probing for the search JSON endpoint...")
+    try:
+        with GrouponScraper(record_network=True) as browser:
+            endpoint = browser.probe_search_endpoint(search_term, zip_code)
+    except Exception as e:
+        # Nothing was learned, so the next run probes again
+        logger.warning(f"Search endpoint probe failed: {e}")
+        return
+    
+    if endpoint:
+        logger.info(f"Found search endpoint: {endpoint['url']}")
+    else:
+        logger.info("No usable search endpoint found")
+    save_search_endpoint(endpoint or {"url": None})
+
+# Browsers of this worker process, shared by every ZIP code it scrapes
+_worker_pool: Optional[DriverPool] = None
+
+def init_worker():
+    """Give a worker process one browser pool that lives until the worker exits."""
+    global _worker_pool
+    _worker_pool = DriverPool()
+    multiprocessing.util.Finalize(None, close_worker, exitpriority=10)
+
+def close_worker():
+    """Quit the worker's browsers and clear out any Chrome it leaked, leaving siblings alone."""
+    if _worker_pool is not None:
+        _worker_pool.close()
+    kill_own_chrome()
+
+async def scrape_zip(search_term: str, zip_code: str, pool: Optional[DriverPool] = None) -> List[Dict]:
+    """Scrape deals for one ZIP code."""
+    async with AsyncGrouponScraper(pool=pool) as scraper:
+        return [deal async for deal in scraper.scrape_deals(search_term, zip_code)]
+
+def scrape_one_zip(search_term: str, zip_code: str) -> List[Dict]:
+    """Scrape one ZIP code in a worker process, reusing the worker's browsers."""
+    logger.info(f"Processing ZIP code: {zip_code}")
+    return asyncio.run(scrape_zip(search_term, zip_code, _worker_pool))
 
 def main():
     """Main entry point."""
@@ -305,30 +832,33 @@ def main():
             raise ValueError("No ZIP codes found in zipcodes.txt")
         
         search_term = "Hydrafacial"
+        _cleanup_once()
         logger.info(f"Starting scraper with search term '{search_term}' and {len(zip_codes)} ZIP codes")
+        discover_search_endpoint(search_term, zip_codes[0])
         
-        try:
-            scraper = GrouponScraper()
-            all_deals = []
-            
-            # Scrape deals for each zip code
-            logger.info(f"Starting scrape for '{search_term}' in {len(zip_codes)} ZIP codes")
-            for zip_code in zip_codes:
-                logger.info(f"Processing ZIP code: {zip_code}")
-                deals = scraper.scrape_deals(search_term, zip_code)
-                all_deals.extend(deals)
-            
-            # Save results
-            output_file = log_dir / "deals.json"
-            with open(output_file, "w", encoding='utf-8') as f:
-                json.dump(all_deals, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Found total {len(all_deals)} deals. Saved to {output_file}")
-            
-        finally:
-            # Clean up
-            if 'scraper' in locals():
-                del scraper
+        # Scrape zip codes in parallel, one browser per worker process, writing
+        # each ZIP code's deals as soon as its worker finishes
+        jsonl_file = log_dir / "deals.jsonl"
+        total = 0
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=init_worker) as executor, \
+                open(jsonl_file, "wb", buffering=1 << 20) as f:
+            futures = {executor.submit(scrape_one_zip, search_term, zip_code): zip_code for zip_code in zip_codes}
+            for future in as_completed(futures):
+                # One failed ZIP code shouldn't throw away every other ZIP code's deals
+                try:
+                    deals = future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping ZIP code {futures[future]}: {e}")
+                    continue
+                for deal in deals:
+                    f.write(orjson.dumps(deal) + b"\n")
+                    total += 1
+        
+        # Save results
+        output_file = log_dir / "deals.json"
+        jsonl_to_json(jsonl_file, output_file)
+        
+        logger.info(f"Found total {total} deals. Saved to {output_file}")
         
     except Exception as e:
         logger.error(f"Error: {e}")